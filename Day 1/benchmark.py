@@ -0,0 +1,75 @@
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Iterator, Optional
+
+import day1
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+LEGACY_LIMIT = 10 ** 4
+BATCH_REPORT_SIZE = 10 ** 4
+BATCH_TARGETS = 5000
+
+
+def legacy_part1(target: int) -> Optional[int]:
+    found_numbers = set()
+    for val in day1.for_int_in_file():
+        if target - val in found_numbers:
+            return val * (target - val)
+        found_numbers.add(val)
+    return None
+
+
+def legacy_part2(target: int) -> Optional[int]:
+    for val in day1.for_int_in_file():
+        result = legacy_part1(target - val)
+        if result is not None:
+            return val * result
+    return None
+
+
+def new_part2(target: int) -> Optional[int]:
+    return day1.part2(day1.ExpenseReport.from_file(), target)
+
+
+def synthetic_report(size: int) -> Iterator[int]:
+    for _ in range(size):
+        yield random.randrange(1, 10 * size)
+
+
+def timed(func: Callable[[int], Optional[int]], target: int) -> float:
+    start = time.perf_counter()
+    func(target)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        day1.INPUT = os.path.join(tmp, "input")
+        for size in SIZES:
+            values = list(synthetic_report(size))
+            target = sum(random.sample(values, 3))
+            with open(day1.INPUT, "w") as fout:
+                fout.writelines(f"{v}\n" for v in values)
+
+            new_time = timed(new_part2, target)
+            if size <= LEGACY_LIMIT:
+                legacy = f"{timed(legacy_part2, target):.3f}s"
+            else:
+                legacy = "skipped"
+            print(f"n={size:>9}  k-sum engine {new_time:.3f}s  legacy {legacy}")
+
+    report = day1.ExpenseReport(synthetic_report(BATCH_REPORT_SIZE))
+    targets = [random.randrange(1, 30 * BATCH_REPORT_SIZE) for _ in range(BATCH_TARGETS)]
+    for k in (2, 3):
+        start = time.perf_counter()
+        report.batch_k_sum(targets, k)
+        elapsed = time.perf_counter() - start
+        print(f"batch {k}-sum  n={BATCH_REPORT_SIZE}  {BATCH_TARGETS} targets  "
+              f"{elapsed / BATCH_TARGETS * 1e6:.1f}us/target  {BATCH_TARGETS / elapsed:.0f} targets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
-from typing import Iterator, Optional
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from math import prod
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 
 TARGET = 2020
 INPUT = "input"
@@ -10,23 +15,80 @@ def for_int_in_file() -> Iterator[int]:
             yield int(line)
 
 
-def part1(target: int) -> Optional[int]:
-    found_numbers = set()
-    for val in for_int_in_file():
-        if target - val in found_numbers:
-            return val * (target - val)
-        found_numbers.add(val)
-    return None
+class ExpenseReport:
+    def __init__(self, values: Iterable[int]) -> None:
+        self.values = array("q", sorted(values))
+
+    @classmethod
+    def from_file(cls) -> ExpenseReport:
+        return cls(for_int_in_file())
+
+    def two_sum(self, target: int, lo: int = 0) -> Optional[Tuple[int, int]]:
+        values = self.values
+        hi = len(values) - 1
+        while lo < hi:
+            total = values[lo] + values[hi]
+            if total == target:
+                return values[lo], values[hi]
+            if total < target:
+                lo += 1
+            else:
+                hi -= 1
+        return None
+
+    def k_sum(self, target: int, k: int, lo: int = 0) -> Optional[Tuple[int, ...]]:
+        # Finds k values (k >= 1) from values[lo:] summing to target, returned in ascending order.
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        values = self.values
+        n = len(values)
+        if k == 1:
+            i = bisect_left(values, target, lo)
+            return (target,) if i < n and values[i] == target else None
+        if k == 2:
+            return self.two_sum(target, lo)
+
+        largest_rest = sum(values[n - k + 1:])
+        for i in range(lo, n - k + 1):
+            val = values[i]
+            if i > lo and val == values[i - 1]:
+                continue
+            if val + sum(values[i + 1:i + k]) > target:
+                break
+            if val + largest_rest < target:
+                continue
+            rest = self.k_sum(target - val, k - 1, i + 1)
+            if rest is not None:
+                return (val,) + rest
+        return None
+
+    def batch_k_sum(self, targets: Iterable[int], k: int) -> Dict[int, Optional[Tuple[int, ...]]]:
+        # Repeated targets are answered once and share one entry. Targets outside the range of possible
+        # k-sums are answered without a scan; every other target is still its own k_sum search.
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        values = self.values
+        if len(values) < k:
+            return {target: None for target in targets}
+        smallest = sum(values[:k])
+        largest = sum(values[len(values) - k:])
+        return {
+            target: self.k_sum(target, k) if smallest <= target <= largest else None
+            for target in sorted(set(targets))
+        }
+
+
+def part1(report: ExpenseReport, target: int) -> Optional[int]:
+    result = report.k_sum(target, 2)
+    return None if result is None else prod(result)
 
 
-def part2() -> Optional[int]:
-    for val in for_int_in_file():
-        result = part1(TARGET - val)
-        if result is not None:
-            return val * result
-    return None
+def part2(report: ExpenseReport, target: int) -> Optional[int]:
+    result = report.k_sum(target, 3)
+    return None if result is None else prod(result)
 
 
 if __name__ == "__main__":
-    print(part1(TARGET))
-    print(part2())
+    expense_report = ExpenseReport.from_file()
+    print(part1(expense_report, TARGET))
+    print(part2(expense_report, TARGET))
@@ -1,18 +1,10 @@
-import functools
 import itertools
-from collections import Counter
-from typing import Iterable, List, Optional, Tuple
+from collections import Counter, deque
+from typing import Deque, Iterable, Tuple
 
 INPUT = "input"
-SORT_SIZE = 200
-
-
-def pidgeonhole_sort(iterable: Iterable[int], size: int) -> List[int]:
-    holes: List[Optional[int]] = [None] * size
-    for adapter in iterable:
-        holes[adapter] = adapter
-
-    return [v for v in holes if v is not None]
+MAX_GAP = 3
+OUTLET = 0
 
 
 def read_input() -> Iterable[int]:
@@ -21,29 +13,29 @@ def read_input() -> Iterable[int]:
             yield int(line)
 
 
-@functools.lru_cache(maxsize=None)
-def num_combinations(current_adapter: int, list_remainder: Tuple[int]) -> int:
-    if len(list_remainder) == 0:
-        return 1
-    combinations = 0
-    for i, adapter in enumerate(list_remainder):
-        if adapter - current_adapter < 4:
-            combinations += num_combinations(adapter, list_remainder[i + 1:])
-        else:
-            break
-    return combinations
+def num_combinations(sorted_adapters: Iterable[int], max_gap: int = MAX_GAP, outlet: int = OUTLET) -> int:
+    reachable: Deque[Tuple[int, int]] = deque([(outlet, 1)])
+    reachable_ways = 1
+    ways = 1
+    for adapter in sorted_adapters:
+        while reachable and adapter - reachable[0][0] > max_gap:
+            reachable_ways -= reachable.popleft()[1]
+        ways = reachable_ways
+        reachable.append((adapter, ways))
+        reachable_ways += ways
+    return ways
 
 
 def main() -> None:
-    adapters = pidgeonhole_sort(read_input(), SORT_SIZE)
+    adapters = sorted(set(read_input()))
 
     all_diffs = itertools.chain(
-        [3, adapters[0]],
+        [MAX_GAP, adapters[0] - OUTLET],
         (next_elem - elem for elem, next_elem in zip(adapters, adapters[1:]))
     )
     counter = Counter(all_diffs)
-    print(counter[1] * counter[3])
-    print(num_combinations(0, tuple(adapters)))
+    print(counter[1] * counter[MAX_GAP])
+    print(num_combinations(adapters))
 
 
 if __name__ == "__main__":
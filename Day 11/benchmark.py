@@ -0,0 +1,52 @@
+import io
+import random
+import time
+
+import day11
+
+LAYOUT_SIZES = [100, 300, 1000]
+SEAT_DENSITY = 0.05
+
+
+def synthetic_layout(size: int) -> str:
+    return "".join(
+        "".join("L" if random.random() < SEAT_DENSITY else "." for _ in range(size)) + "\n" for _ in range(size)
+    )
+
+
+def main() -> None:
+    random.seed(0)
+    for size in LAYOUT_SIZES:
+        layout = synthetic_layout(size)
+        rows = layout.split()
+
+        if size <= 300:
+            start = time.perf_counter()
+            day11.Grid(io.StringIO(layout), False, 5)
+            ray_walk = f"{time.perf_counter() - start:.3f}s"
+        else:
+            ray_walk = "skipped"
+
+        start = time.perf_counter()
+        day11.compute_neighbour_table(rows, False)
+        sweep = time.perf_counter() - start
+
+        simulation = day11.SeatSimulation(io.StringIO(layout), False, 5)
+        start = time.perf_counter()
+        generations = 0
+        while simulation.step():
+            generations += 1
+        stepping = time.perf_counter() - start
+
+        with day11.PartitionedSeatSimulation(io.StringIO(layout), False, 5) as partitioned:
+            start = time.perf_counter()
+            while partitioned.step():
+                pass
+            partitioned_stepping = time.perf_counter() - start
+
+        print(f"{size}x{size}  construction: ray-walk Grid {ray_walk}, sweep table {sweep:.3f}s  "
+              f"stepping: {generations} generations {stepping:.3f}s, partitioned {partitioned_stepping:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
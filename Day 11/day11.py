@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+import os
+import re
+
+from array import array
+from bisect import bisect_left
 from enum import Enum
-from typing import List, Optional, Set, TextIO
+from multiprocessing import Barrier, Pipe, Process, synchronize
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Optional, Sequence, Set, TextIO, Tuple
 
 INPUT = "input"
+FULL_FLAG = 0x10
+NEIGHBOUR_COUNT_MASK = 0x0F
+SEAT_ID_TYPECODE = "i"
+TOGGLE_REGEX = re.compile(b"\x01")
+FULL_TABLE = bytes(code & FULL_FLAG != 0 for code in range(256))
 
 NEIGHBOUR_VECTORS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+LINE_DIRECTIONS = [(1, 0), (-1, 1), (0, 1), (1, 1)]
 
 
 class SeatStatus(Enum):
@@ -105,11 +119,260 @@ class Grid:
         return "\n".join("".join(str(x) for x in row) for row in self.grid) + "\n"
 
 
+def line_of_sight_pairs(rows: Sequence[str], strict_adjacency: bool) -> Iterator[Tuple[int, int]]:
+    # Sweeps the layout once per line direction, keeping only the nearest seat seen along each line in the previous
+    # and current rows, so memory is two rows per sweep rather than one entry per cell.
+    width = len(rows[0]) if rows else 0
+    floor = SeatStatus.FLOOR.value
+    for x_vector, y_vector in LINE_DIRECTIONS:
+        previous_row = array(SEAT_ID_TYPECODE, [-1]) * width
+        seat = 0
+        for row in rows:
+            current_row = array(SEAT_ID_TYPECODE, [-1]) * width
+            source_row = previous_row if y_vector else current_row
+            for x, val in enumerate(row):
+                source_x = x - x_vector
+                previous = source_row[source_x] if 0 <= source_x < width else -1
+                if val != floor:
+                    if previous != -1:
+                        yield previous, seat
+                    current_row[x] = seat
+                    seat += 1
+                elif not strict_adjacency:
+                    current_row[x] = previous
+            previous_row = current_row
+
+
+def compute_neighbour_table(rows: Sequence[str], strict_adjacency: bool) -> Tuple[array, array, array]:
+    # Built in two sweeps (degrees, then neighbours) so no per-edge list is ever materialised.
+    width = len(rows[0]) if rows else 0
+    positions = array(SEAT_ID_TYPECODE)
+    for y, row in enumerate(rows):
+        for x, val in enumerate(row):
+            if SeatStatus(val) != SeatStatus.FLOOR:
+                positions.append(y * width + x)
+
+    degrees = bytearray(len(positions))
+    for a, b in line_of_sight_pairs(rows, strict_adjacency):
+        degrees[a] += 1
+        degrees[b] += 1
+
+    offsets = array("q", [0])
+    for degree in degrees:
+        offsets.append(offsets[-1] + degree)
+    neighbours = array(SEAT_ID_TYPECODE, [0]) * offsets[-1]
+    next_slot = offsets[:-1]
+    for a, b in line_of_sight_pairs(rows, strict_adjacency):
+        neighbours[next_slot[a]] = b
+        next_slot[a] += 1
+        neighbours[next_slot[b]] = a
+        next_slot[b] += 1
+    return positions, offsets, neighbours
+
+
+def initial_codes(rows: Sequence[str], positions: array, offsets: array, neighbours: array) -> bytearray:
+    width = len(rows[0]) if rows else 0
+    codes = bytearray(len(positions))
+    for seat, position in enumerate(positions):
+        if SeatStatus(rows[position // width][position % width]) == SeatStatus.FULL:
+            codes[seat] |= FULL_FLAG
+    for seat in range(len(positions)):
+        if codes[seat] & FULL_FLAG:
+            for neighbour in neighbours[offsets[seat]:offsets[seat + 1]]:
+                codes[neighbour] += 1
+    return codes
+
+
+def compute_toggle_table(num_occupied_to_move: int) -> bytes:
+    return bytes(
+        (code & FULL_FLAG == 0 and code & NEIGHBOUR_COUNT_MASK == 0)
+        or (code & FULL_FLAG != 0 and code & NEIGHBOUR_COUNT_MASK >= num_occupied_to_move)
+        for code in range(256)
+    )
+
+
+class SeatSimulation:
+    def __init__(self, fin: TextIO, strict_adjacency: bool, num_occupied_to_move: int) -> None:
+        rows = [line.strip() for line in fin]
+        self.width = len(rows[0]) if rows else 0
+        self.height = len(rows)
+        self.positions, self.offsets, self.neighbours = compute_neighbour_table(rows, strict_adjacency)
+        self.codes = initial_codes(rows, self.positions, self.offsets, self.neighbours)
+        self.toggle_table = compute_toggle_table(num_occupied_to_move)
+
+    def step(self) -> bool:
+        codes = self.codes
+        offsets = self.offsets
+        neighbours = self.neighbours
+        changes = [match.start() for match in TOGGLE_REGEX.finditer(codes.translate(self.toggle_table))]
+        for seat in changes:
+            codes[seat] ^= FULL_FLAG
+            delta = 1 if codes[seat] & FULL_FLAG else -1
+            for neighbour in neighbours[offsets[seat]:offsets[seat + 1]]:
+                codes[neighbour] += delta
+        return len(changes) > 0
+
+    def num_occupied(self) -> int:
+        return self.codes.translate(FULL_TABLE).count(1)
+
+    def __str__(self) -> str:
+        cells = [[SeatStatus.FLOOR.value] * self.width for _ in range(self.height)]
+        for seat, position in enumerate(self.positions):
+            status = SeatStatus.FULL if self.codes[seat] & FULL_FLAG else SeatStatus.EMPTY
+            cells[position // self.width][position % self.width] = status.value
+        return "\n".join("".join(row) for row in cells) + "\n"
+
+
+class Band:
+    def __init__(self, start: int, end: int, codes: bytearray, offsets: array, neighbours: array) -> None:
+        # A band keeps packed codes for its own seats only, and its neighbour table holds in-band neighbours as
+        # band-local indices. Neighbours in other bands are reached through exported (local seats other bands
+        # watch) and ghosts (foreign seat -> local seats that count it as a neighbour).
+        self.start = start
+        self.end = end
+        self.codes = codes[start:end]
+        self.offsets = array("q", [0])
+        self.neighbours = array(SEAT_ID_TYPECODE)
+        self.exported = bytearray(end - start)
+        self.ghosts: Dict[int, array] = {}
+        for seat in range(start, end):
+            for neighbour in neighbours[offsets[seat]:offsets[seat + 1]]:
+                if start <= neighbour < end:
+                    self.neighbours.append(neighbour - start)
+                else:
+                    self.exported[seat - start] = 1
+                    self.ghosts.setdefault(neighbour, array(SEAT_ID_TYPECODE)).append(seat - start)
+            self.offsets.append(len(self.neighbours))
+
+
+def _run_band(
+    connection: Connection,
+    barrier: synchronize.Barrier,
+    outbox_names: List[str],
+    index: int,
+    band: Band,
+    toggle_table: bytes,
+) -> None:
+    # Each generation the band toggles its own seats, then publishes the toggled exported seats in its outbox as
+    # seat (now full) or ~seat (now empty). After the barrier it applies the other bands' deltas to its ghost
+    # neighbours. The parent only sends the next command once every band has replied, so outboxes are never
+    # overwritten while another band is still reading them.
+    outboxes = [SharedMemory(name=name) for name in outbox_names]
+    slots = [outbox.buf.cast("q") for outbox in outboxes]
+    codes = band.codes
+    offsets = band.offsets
+    neighbours = band.neighbours
+    exported = band.exported
+    ghosts = band.ghosts
+    outbox = slots[index]
+    try:
+        for command in iter(connection.recv, None):
+            if command == "count":
+                connection.send(codes.translate(FULL_TABLE).count(1))
+                continue
+
+            changes = [match.start() for match in TOGGLE_REGEX.finditer(codes.translate(toggle_table))]
+            sent = 0
+            for seat in changes:
+                codes[seat] ^= FULL_FLAG
+                full = codes[seat] & FULL_FLAG
+                delta = 1 if full else -1
+                for neighbour in neighbours[offsets[seat]:offsets[seat + 1]]:
+                    codes[neighbour] += delta
+                if exported[seat]:
+                    sent += 1
+                    outbox[sent] = band.start + seat if full else ~(band.start + seat)
+            outbox[0] = sent
+
+            barrier.wait()
+            for other, slot in enumerate(slots):
+                if other == index:
+                    continue
+                for entry in slot[1:slot[0] + 1]:
+                    targets = ghosts.get(entry if entry >= 0 else ~entry)
+                    if targets is not None:
+                        delta = 1 if entry >= 0 else -1
+                        for seat in targets:
+                            codes[seat] += delta
+            connection.send(len(changes))
+    finally:
+        for slot in slots:
+            slot.release()
+        for outbox in outboxes:
+            outbox.close()
+
+
+class PartitionedSeatSimulation:
+    def __init__(
+        self, fin: TextIO, strict_adjacency: bool, num_occupied_to_move: int, num_bands: Optional[int] = None
+    ) -> None:
+        # Only stepping is partitioned. The neighbour table, the initial codes and the per-band tables are all
+        # built serially in this process; the global tables are dropped before the workers start.
+        rows = [line.strip() for line in fin]
+        width = len(rows[0]) if rows else 0
+        positions, offsets, neighbours = compute_neighbour_table(rows, strict_adjacency)
+        codes = initial_codes(rows, positions, offsets, neighbours)
+        toggle_table = compute_toggle_table(num_occupied_to_move)
+
+        num_bands = max(1, min(num_bands or os.cpu_count() or 1, len(rows)))
+        seat_boundaries = [bisect_left(positions, len(rows) * band // num_bands * width) for band in range(num_bands)]
+        seat_boundaries.append(len(positions))
+        bands = [
+            Band(start, end, codes, offsets, neighbours)
+            for start, end in zip(seat_boundaries, seat_boundaries[1:])
+            if start < end
+        ]
+        del rows, positions, offsets, neighbours, codes
+
+        self.outboxes = [SharedMemory(create=True, size=8 * (1 + sum(band.exported))) for band in bands]
+        barrier = Barrier(len(bands)) if bands else None
+        self.connections: List[Connection] = []
+        self.workers: List[Process] = []
+        for index, band in enumerate(bands):
+            parent_end, child_end = Pipe()
+            worker = Process(
+                target=_run_band,
+                args=(child_end, barrier, [outbox.name for outbox in self.outboxes], index, band, toggle_table),
+                daemon=True,
+            )
+            worker.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.workers.append(worker)
+
+    def _broadcast(self, command: str) -> int:
+        for connection in self.connections:
+            connection.send(command)
+        return sum(connection.recv() for connection in self.connections)
+
+    def step(self) -> bool:
+        return self._broadcast("step") > 0
+
+    def num_occupied(self) -> int:
+        return self._broadcast("count")
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        for outbox in self.outboxes:
+            outbox.close()
+            outbox.unlink()
+
+    def __enter__(self) -> PartitionedSeatSimulation:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
 def main() -> None:
     with open(INPUT, "r") as fin:
-        part_1_grid = Grid(fin, True, 4)
+        part_1_grid = SeatSimulation(fin, True, 4)
     with open(INPUT, "r") as fin:
-        part_2_grid = Grid(fin, False, 5)
+        part_2_grid = SeatSimulation(fin, False, 5)
 
     while part_1_grid.step():
         pass
@@ -0,0 +1,56 @@
+import random
+import time
+
+import day12
+
+COMMANDS = 10 ** 7
+LEGACY_COMMANDS = 10 ** 6
+MOVES = "NESWF"
+TURNS = "LR"
+
+
+def synthetic_log(length: int) -> bytes:
+    lines = []
+    for _ in range(length):
+        if random.random() < 0.2:
+            lines.append(f"{random.choice(TURNS)}{random.choice((90, 180, 270))}\n")
+        else:
+            lines.append(f"{random.choice(MOVES)}{random.randint(1, 100)}\n")
+    return "".join(lines).encode()
+
+
+def legacy_run(log: bytes) -> None:
+    ships = [day12.Part1Ship(), day12.Part2Ship()]
+    for line in log.decode().splitlines():
+        command = day12.Command(line[0])
+        arg = int(line[1:])
+        for ship in ships:
+            ship.follow_command(command, arg)
+
+
+def main() -> None:
+    random.seed(0)
+    log = synthetic_log(COMMANDS)
+
+    start = time.perf_counter()
+    opcodes, args = day12.parse_log(log)
+    parsed = time.perf_counter() - start
+    print(f"parse {COMMANDS} commands: {parsed:.3f}s")
+
+    for model in day12.SHIP_MODELS:
+        ship = model()
+        start = time.perf_counter()
+        ship.follow_commands(opcodes, args)
+        elapsed = time.perf_counter() - start
+        print(f"{model.__name__}: {elapsed:.3f}s  {COMMANDS / elapsed:,.0f} commands/s")
+
+    legacy_log = b"".join(log.splitlines(keepends=True)[:LEGACY_COMMANDS])
+    start = time.perf_counter()
+    legacy_run(legacy_log)
+    elapsed = time.perf_counter() - start
+    print(f"per-line dispatch, both ships, {LEGACY_COMMANDS} commands: {elapsed:.3f}s  "
+          f"{LEGACY_COMMANDS / elapsed:,.0f} commands/s")
+
+
+if __name__ == "__main__":
+    main()
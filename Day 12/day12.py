@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from math import sin, cos, radians
+from functools import reduce
+from operator import itemgetter
+from typing import Callable, List, NamedTuple, Optional, Protocol, Sequence, Tuple, TypeVar, Union
 
 INPUT = "input"
+QUARTER_TURN = 90
+CHECKPOINT_INTERVAL = 1024
+PARALLEL_CHUNK_SIZE = 1 << 16
 
 
 class Command(Enum):
@@ -44,11 +51,8 @@ class Point:
         return abs(self.x) + abs(self.y)
 
     def rotate_about_origin(self, degrees: int) -> None:
-        rad = radians(degrees)
-        new_x = self.x * cos(rad) + self.y * sin(rad)
-        new_y = - self.x * sin(rad) + self.y * cos(rad)
-        self.x = int(round(new_x))
-        self.y = int(round(new_y))
+        for _ in range((degrees // QUARTER_TURN) % 4):
+            self.x, self.y = self.y, -self.x
 
     def move(self, direction: Direction, distance: int) -> None:
         self += VECTORS[direction] * distance
@@ -77,6 +81,46 @@ VECTORS = {
 }
 
 
+COMMAND_ORDER = list(Command)
+OPCODES = {command: opcode for opcode, command in enumerate(COMMAND_ORDER)}
+OPCODE_TABLE = bytes.maketrans("".join(c.value for c in COMMAND_ORDER).encode(), bytes(range(len(COMMAND_ORDER))))
+OP_F = OPCODES[Command.F]
+MOVE_OPCODES = {OPCODES[command]: VECTORS[direction] for command, direction in COMMAND_TO_DIR.items()}
+TURN_SIGNS = {OPCODES[command]: sign for command, sign in ROTATION_DIRECTION.items()}
+VECTOR_TO_DIRECTION = {(vector.x, vector.y): direction for direction, vector in VECTORS.items()}
+
+
+def parse_log(buffer: Union[str, bytes]) -> Tuple[bytes, array]:
+    lines = (buffer.encode() if isinstance(buffer, str) else buffer).split()
+    opcodes = bytes(map(itemgetter(0), lines)).translate(OPCODE_TABLE)
+    if opcodes and max(opcodes) >= len(COMMAND_ORDER):
+        line = next(line for line, opcode in zip(lines, opcodes) if opcode >= len(COMMAND_ORDER))
+        raise ValueError(f"Unknown navigation command: {line.decode(errors='replace')!r}")
+    args = array("q", map(int, map(itemgetter(slice(1, None)), lines)))
+    return opcodes, args
+
+
+def quarter_turns(opcode: int, arg: int) -> int:
+    return (arg // QUARTER_TURN * TURN_SIGNS[opcode]) % 4
+
+
+class ShipModel(Protocol):
+    position: Point
+
+    def follow_commands(self, opcodes: bytes, args: array) -> None:
+        ...
+
+
+ModelClass = TypeVar("ModelClass", bound=type)
+SHIP_MODELS: List[Callable[[], ShipModel]] = []
+
+
+def register_ship_model(model: ModelClass) -> ModelClass:
+    SHIP_MODELS.append(model)
+    return model
+
+
+@register_ship_model
 class Part1Ship:
     def __init__(self) -> None:
         self.position = Point(0, 0)
@@ -88,7 +132,26 @@ class Part1Ship:
         else:
             self.position.move(COMMAND_TO_DIR.get(command, self.direction), arg)
 
+    def follow_commands(self, opcodes: bytes, args: array) -> None:
+        x, y = self.position.x, self.position.y
+        heading = VECTORS[self.direction]
+        dx, dy = heading.x, heading.y
+        for opcode, arg in zip(opcodes, args):
+            if opcode == OP_F:
+                x += dx * arg
+                y += dy * arg
+            elif opcode in MOVE_OPCODES:
+                vector = MOVE_OPCODES[opcode]
+                x += vector.x * arg
+                y += vector.y * arg
+            else:
+                for _ in range(quarter_turns(opcode, arg)):
+                    dx, dy = dy, -dx
+        self.position = Point(x, y)
+        self.direction = VECTOR_TO_DIRECTION[dx, dy]
+
 
+@register_ship_model
 class Part2Ship:
     def __init__(self) -> None:
         self.position = Point(0, 0)
@@ -102,18 +165,137 @@ class Part2Ship:
         else:
             self.waypoint.rotate_about_origin(arg * ROTATION_DIRECTION[command])
 
+    def follow_commands(self, opcodes: bytes, args: array) -> None:
+        x, y = self.position.x, self.position.y
+        wx, wy = self.waypoint.x, self.waypoint.y
+        for opcode, arg in zip(opcodes, args):
+            if opcode == OP_F:
+                x += wx * arg
+                y += wy * arg
+            elif opcode in MOVE_OPCODES:
+                vector = MOVE_OPCODES[opcode]
+                wx += vector.x * arg
+                wy += vector.y * arg
+            else:
+                for _ in range(quarter_turns(opcode, arg)):
+                    wx, wy = wy, -wx
+        self.position = Point(x, y)
+        self.waypoint = Point(wx, wy)
+
+
+Vector = Tuple[int, int]
+Matrix = Tuple[int, int, int, int]
+
+IDENTITY: Matrix = (1, 0, 0, 1)
+ZERO_MATRIX: Matrix = (0, 0, 0, 0)
+ZERO_VECTOR: Vector = (0, 0)
+CLOCKWISE_QUARTER_TURN: Matrix = (0, 1, -1, 0)
+
+
+def matrix_multiply(left: Matrix, right: Matrix) -> Matrix:
+    a, b, c, d = left
+    e, f, g, h = right
+    return a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h
+
+
+def matrix_add(left: Matrix, right: Matrix) -> Matrix:
+    return left[0] + right[0], left[1] + right[1], left[2] + right[2], left[3] + right[3]
+
+
+def matrix_apply(matrix: Matrix, vector: Vector) -> Vector:
+    return matrix[0] * vector[0] + matrix[1] * vector[1], matrix[2] * vector[0] + matrix[3] * vector[1]
+
+
+def vector_add(left: Vector, right: Vector) -> Vector:
+    return left[0] + right[0], left[1] + right[1]
+
+
+def rotation(degrees: int) -> Matrix:
+    return reduce(matrix_multiply, [CLOCKWISE_QUARTER_TURN] * ((degrees // QUARTER_TURN) % 4), IDENTITY)
+
+
+class Transform(NamedTuple):
+    # Maps a (position, heading) state to (position + travel * heading + shift, turn * heading + heading_shift).
+    turn: Matrix = IDENTITY
+    heading_shift: Vector = ZERO_VECTOR
+    travel: Matrix = ZERO_MATRIX
+    shift: Vector = ZERO_VECTOR
+
+    def then(self, other: Transform) -> Transform:
+        return Transform(
+            matrix_multiply(other.turn, self.turn),
+            vector_add(matrix_apply(other.turn, self.heading_shift), other.heading_shift),
+            matrix_add(self.travel, matrix_multiply(other.travel, self.turn)),
+            vector_add(vector_add(self.shift, matrix_apply(other.travel, self.heading_shift)), other.shift),
+        )
+
+    def apply(self, position: Vector, heading: Vector) -> Tuple[Vector, Vector]:
+        return (
+            vector_add(vector_add(position, matrix_apply(self.travel, heading)), self.shift),
+            vector_add(matrix_apply(self.turn, heading), self.heading_shift),
+        )
+
+
+IDENTITY_TRANSFORM = Transform()
+
+
+def command_transform(command: Command, arg: int, moves_waypoint: bool) -> Transform:
+    if command in ROTATION_DIRECTION:
+        return Transform(turn=rotation(arg * ROTATION_DIRECTION[command]))
+    if command == Command.F:
+        return Transform(travel=(arg, 0, 0, arg))
+    vector = VECTORS[COMMAND_TO_DIR[command]] * arg
+    if moves_waypoint:
+        return Transform(heading_shift=(vector.x, vector.y))
+    return Transform(shift=(vector.x, vector.y))
+
+
+def compose(transforms: Sequence[Transform]) -> Transform:
+    return reduce(Transform.then, transforms, IDENTITY_TRANSFORM)
+
+
+def parallel_compose(
+    transforms: Sequence[Transform], workers: Optional[int] = None, chunk_size: int = PARALLEL_CHUNK_SIZE
+) -> Transform:
+    chunks = [transforms[i:i + chunk_size] for i in range(0, len(transforms), chunk_size)]
+    if len(chunks) <= 1:
+        return compose(transforms)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return compose(list(pool.map(compose, chunks)))
+
+
+class NavigationLog:
+    def __init__(
+        self,
+        commands: Sequence[Tuple[Command, int]],
+        moves_waypoint: bool,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+    ) -> None:
+        self.transforms = [command_transform(command, arg, moves_waypoint) for command, arg in commands]
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints: List[Transform] = [IDENTITY_TRANSFORM]
+        for start in range(0, len(self.transforms), checkpoint_interval):
+            chunk = self.transforms[start:start + checkpoint_interval]
+            self.checkpoints.append(self.checkpoints[-1].then(compose(chunk)))
+
+    def transform_after(self, num_commands: int) -> Transform:
+        if not 0 <= num_commands <= len(self.transforms):
+            raise ValueError(f"num_commands must be between 0 and {len(self.transforms)}, got {num_commands}")
+        checkpoint, remainder = divmod(num_commands, self.checkpoint_interval)
+        start = checkpoint * self.checkpoint_interval
+        return self.checkpoints[checkpoint].then(compose(self.transforms[start:start + remainder]))
+
+    def state_after(self, num_commands: int, position: Vector, heading: Vector) -> Tuple[Vector, Vector]:
+        return self.transform_after(num_commands).apply(position, heading)
+
 
 def main() -> None:
-    part_1_ship = Part1Ship()
-    part_2_ship = Part2Ship()
-    with open(INPUT, "r") as fin:
-        for line in fin:
-            command = Command(line[0])
-            arg = int(line[1:])
-            part_1_ship.follow_command(command, arg)
-            part_2_ship.follow_command(command, arg)
-    print(part_1_ship.position.manhatten_distance())
-    print(part_2_ship.position.manhatten_distance())
+    with open(INPUT, "rb") as fin:
+        opcodes, args = parse_log(fin.read())
+    ships = [model() for model in SHIP_MODELS]
+    for ship in ships:
+        ship.follow_commands(opcodes, args)
+        print(ship.position.manhatten_distance())
 
 
 if __name__ == "__main__":
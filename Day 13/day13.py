@@ -4,22 +4,33 @@ from typing import List, Tuple
 INPUT = "input"
 
 
-def find_next_occurrance(current_time: int, current_interval: int, offset: int, frequency: int) -> int:
-    t = current_time
-    while (t + offset) % frequency != 0:
-        t += current_interval
-    return t
+def extended_gcd(a: int, b: int) -> Tuple[int, int, int]:
+    old_r, r = a, b
+    old_s, s = 1, 0
+    old_t, t = 0, 1
+    while r:
+        quotient = old_r // r
+        old_r, r = r, old_r - quotient * r
+        old_s, s = s, old_s - quotient * s
+        old_t, t = t, old_t - quotient * t
+    return old_r, old_s, old_t
+
+
+def combine_congruences(residue: int, modulus: int, other_residue: int, other_modulus: int) -> Tuple[int, int]:
+    gcd, inverse, _ = extended_gcd(modulus % other_modulus, other_modulus)
+    difference = (other_residue - residue) % other_modulus
+    if difference % gcd != 0:
+        raise ValueError(f"t = {residue} mod {modulus} and t = {other_residue} mod {other_modulus} are inconsistent")
+    reduced_modulus = other_modulus // gcd
+    step = difference // gcd * inverse % reduced_modulus
+    return residue + modulus * step, modulus * reduced_modulus
 
 
 def part2(busses: List[Tuple[int, int]]) -> int:
-    current_interval = busses[0][1]
-    current_time = 0
+    residue, modulus = 0, 1
     for offset, frequency in busses:
-        first_occurance = find_next_occurrance(current_time, current_interval, offset, frequency)
-        second_occurance = find_next_occurrance(first_occurance + current_interval, current_interval, offset, frequency)
-        current_interval = second_occurance - first_occurance
-        current_time = first_occurance
-    return current_time
+        residue, modulus = combine_congruences(residue, modulus, -offset % frequency, frequency)
+    return residue
 
 
 def main() -> None:
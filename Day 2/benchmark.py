@@ -0,0 +1,55 @@
+import os
+import random
+import string
+import tempfile
+import time
+from typing import Tuple
+
+import day2
+
+LINES = 10 ** 6
+BENCHMARK_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def synthetic_line() -> str:
+    lo = random.randint(1, 10)
+    hi = random.randint(lo + 1, 20)
+    character = random.choice(string.ascii_lowercase[:6])
+    password = "".join(random.choices(string.ascii_lowercase[:6], k=random.randint(hi, hi + 10)))
+    return f"{lo}-{hi} {character}: {password}\n"
+
+
+def per_line_counts() -> Tuple[int, int]:
+    valid_part_1 = 0
+    valid_part_2 = 0
+    with open(day2.INPUT, "r") as fin:
+        for line in fin:
+            policy_str, password = line.strip().split(": ")
+            policy = day2.parse_policy(policy_str)
+            valid_part_1 += day2.validate_password_part_1(policy, password)
+            valid_part_2 += day2.validate_password_part_2(policy, password)
+    return valid_part_1, valid_part_2
+
+
+def main() -> None:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        day2.INPUT = os.path.join(tmp, "input")
+        with open(day2.INPUT, "w") as fout:
+            fout.writelines(synthetic_line() for _ in range(LINES))
+
+        start = time.perf_counter()
+        expected = per_line_counts()
+        print(f"per-line path: {expected}  {time.perf_counter() - start:.3f}s")
+        print(f"policy cache: {day2.parse_policy.cache_info()}, hit rate {day2.policy_cache_hit_rate():.1%}")
+
+        for workers in (1, None):
+            start = time.perf_counter()
+            result = day2.batch_count_valid(day2.INPUT, BENCHMARK_CHUNK_SIZE, workers)
+            elapsed = time.perf_counter() - start
+            assert result == expected, f"batch path counted {result}, per-line path counted {expected}"
+            print(f"batch path (workers={workers}): {result}  {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
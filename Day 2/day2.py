@@ -1,21 +1,35 @@
-from dataclasses import dataclass
+import functools
+import mmap
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
 
 INPUT = "input"
+CHUNK_SIZE = 64 * 1024 * 1024
+FIELD_SEPARATORS = bytes.maketrans(b"-", b" ")
+POLICY_CACHE_SIZE = 4096
 
 
-@dataclass
-class Policy:
+class Policy(NamedTuple):
     character: str
     min: int
     max: int
 
 
+@functools.lru_cache(maxsize=POLICY_CACHE_SIZE)
 def parse_policy(policy: str) -> Policy:
     min_max, character = policy.split(" ")
     min_val, max_val = min_max.split("-")
     return Policy(character, int(min_val), int(max_val))
 
 
+def policy_cache_hit_rate() -> float:
+    info = parse_policy.cache_info()
+    lookups = info.hits + info.misses
+    return info.hits / lookups if lookups else 0.0
+
+
 def validate_password_part_1(policy: Policy, password: str) -> bool:
     return policy.min <= password.count(policy.character) <= policy.max
 
@@ -24,6 +38,59 @@ def validate_password_part_2(policy: Policy, password: str) -> bool:
     return (password[policy.min - 1] == policy.character) != (password[policy.max - 1] == policy.character)
 
 
+def chunk_ranges(path: str, chunk_size: int = CHUNK_SIZE) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, "rb") as fin, mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        start = 0
+        while start < size:
+            end = buf.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_columns(chunk: bytes) -> Tuple[List[int], List[int], List[bytes], List[bytes]]:
+    tokens = chunk.translate(FIELD_SEPARATORS, b":").split()
+    if len(tokens) % 4 != 0:
+        raise ValueError("Malformed password line in chunk")
+    return list(map(int, tokens[0::4])), list(map(int, tokens[1::4])), tokens[2::4], tokens[3::4]
+
+
+def count_valid_columns(
+    mins: List[int], maxes: List[int], characters: List[bytes], passwords: List[bytes]
+) -> Tuple[int, int]:
+    counts = map(bytes.count, passwords, characters)
+    valid_part_1 = sum(map(lambda lo, count, hi: lo <= count <= hi, mins, counts, maxes))
+    valid_part_2 = sum(
+        (password[lo - 1:lo or None] == character) != (password[hi - 1:hi or None] == character)
+        for lo, hi, character, password in zip(mins, maxes, characters, passwords)
+    )
+    return valid_part_1, valid_part_2
+
+
+def count_valid_in_range(path: str, start: int, end: int) -> Tuple[int, int]:
+    with open(path, "rb") as fin, mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        chunk = buf[start:end]
+    return count_valid_columns(*parse_columns(chunk))
+
+
+def batch_count_valid(
+    path: str = INPUT, chunk_size: int = CHUNK_SIZE, workers: Optional[int] = None
+) -> Tuple[int, int]:
+    ranges = chunk_ranges(path, chunk_size)
+    if len(ranges) <= 1 or workers == 1:
+        results = [count_valid_in_range(path, start, end) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            starts, ends = zip(*ranges)
+            results = list(pool.map(count_valid_in_range, [path] * len(ranges), starts, ends))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
 def main() -> None:
     valid_part_1 = 0
     valid_part_2 = 0
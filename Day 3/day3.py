@@ -1,33 +1,110 @@
 from __future__ import annotations
+
+import mmap
+
 from dataclasses import dataclass
-from typing import TextIO
+from math import prod
+from typing import Collection, Dict, Iterator, List, Sequence, TextIO, Tuple, Union
 
 INPUT = "input"
 TREE = "#"
+OPEN = "."
+ROW_TABLE = str.maketrans({TREE: "1", OPEN: "0"})
+ROW_BYTES_TABLE = bytes.maketrans(b"#.", b"10")
+COUNTER_HEX_DIGITS = 8
+COUNTER_BITS = 4 * COUNTER_HEX_DIGITS
+COUNTER_MASK = (1 << COUNTER_BITS) - 1
+SPREAD_TABLE = str.maketrans({"0": "0" * COUNTER_HEX_DIGITS, "1": "0" * (COUNTER_HEX_DIGITS - 1) + "1"})
 
 
-@dataclass
+@dataclass(frozen=True)
 class Pair:
     x: int
     y: int
 
-    def __iadd__(self, other: Pair) -> Pair:
-        self.x += other.x
-        self.y += other.y
-        return self
+
+def parse_row(line: str) -> int:
+    return int(line[::-1].translate(ROW_TABLE), 2)
+
+
+def visited_row_indices(height: int, dys: Collection[int]) -> Iterator[int]:
+    if len(dys) == 1:
+        return iter(range(0, height, next(iter(dys))))
+    return (y for y in range(height) if any(y % dy == 0 for dy in dys))
 
 
 class Grid:
     def __init__(self, fin: TextIO):
-        self.grid = [line.strip() for line in fin]
-        self.width = len(self.grid[0])
-        self.height = len(self.grid)
+        lines = [line.strip() for line in fin]
+        self.width = len(lines[0])
+        self.height = len(lines)
+        self.rows = [parse_row(line) for line in lines]
+
+    def is_tree(self, point: Pair) -> bool:
+        return (self.rows[point.y] >> (point.x % self.width)) & 1 == 1
 
     def get_point(self, point: Pair) -> str:
-        return self.grid[point.y][point.x % self.width]
+        return TREE if self.is_tree(point) else OPEN
 
-    def is_tree(self, point: Pair) -> bool:
-        return self.get_point(point) == TREE
+    def visited_rows(self, dys: Collection[int]) -> Iterator[Tuple[int, int]]:
+        for y in visited_row_indices(self.height, dys):
+            yield y, self.rows[y]
+
+
+class StreamingGrid:
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        line_end = self.buffer.find(b"\n")
+        if line_end == -1:
+            line_end = len(self.buffer)
+        self.width = line_end - (line_end > 0 and self.buffer[line_end - 1:line_end] == b"\r")
+        self.stride = line_end + 1
+        self.height = (len(self.buffer) - self.width) // self.stride + 1
+
+    def close(self) -> None:
+        self.buffer.close()
+        self._file.close()
+
+    def __enter__(self) -> StreamingGrid:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def get_row(self, y: int) -> int:
+        start = y * self.stride
+        return int(self.buffer[start:start + self.width][::-1].translate(ROW_BYTES_TABLE), 2)
+
+    def visited_rows(self, dys: Collection[int]) -> Iterator[Tuple[int, int]]:
+        for y in visited_row_indices(self.height, dys):
+            yield y, self.get_row(y)
+
+
+def count_trees(grid: Union[Grid, StreamingGrid], slopes: Sequence[Pair]) -> List[int]:
+    # Each visited row is widened so every column gets its own COUNTER_BITS-wide counter, then summed into a
+    # histogram keyed by step % width. Slopes sharing a dy share one histogram, so the pass over the rows is
+    # independent of the number of slopes.
+    width = grid.width
+    histograms: Dict[int, List[int]] = {slope.y: [0] * width for slope in slopes}
+    row_format = f"0{width}b"
+    for y, row in grid.visited_rows(histograms.keys()):
+        if row == 0:
+            continue
+        spread = 0
+        for dy, histogram in histograms.items():
+            if y % dy == 0:
+                if not spread:
+                    spread = int(format(row, row_format).translate(SPREAD_TABLE), 16)
+                histogram[(y // dy) % width] += spread
+
+    return [
+        sum(
+            (histograms[slope.y][step] >> (COUNTER_BITS * (step * slope.x % width))) & COUNTER_MASK
+            for step in range(width)
+        )
+        for slope in slopes
+    ]
 
 
 def main() -> None:
@@ -35,19 +112,9 @@ def main() -> None:
         grid = Grid(fin)
 
     vectors = [Pair(1, 1), Pair(3, 1), Pair(5, 1), Pair(7, 1), Pair(1, 2)]
-    tree_product = 1
-    for vector in vectors:
-        position = Pair(0, 0)
-        trees = 0
-        while position.y < grid.height:
-            if grid.is_tree(position):
-                trees += 1
-            position += vector
-
-        if vector == Pair(3, 1):
-            print(trees)
-        tree_product *= trees
-    print(tree_product)
+    trees = count_trees(grid, vectors)
+    print(trees[vectors.index(Pair(3, 1))])
+    print(prod(trees))
 
 
 if __name__ == "__main__":
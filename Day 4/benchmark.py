@@ -0,0 +1,63 @@
+import os
+import random
+import tempfile
+import time
+
+import day4
+
+PASSPORTS = 2 * 10 ** 5
+FIELD_VALUES = {
+    "byr": ["1919", "1920", "1980", "2002", "2003", "abcd"],
+    "iyr": ["2009", "2010", "2015", "2020", "2021"],
+    "eyr": ["2019", "2020", "2025", "2030", "2031"],
+    "hgt": ["60in", "77in", "150cm", "193cm", "194cm", "170", "58in"],
+    "hcl": ["#123abc", "#123abz", "123abc", "#fffffd"],
+    "ecl": ["brn", "wat", "amb", "grn", "hzl"],
+    "cid": ["147", "350"],
+}
+
+
+def synthetic_passport() -> str:
+    fields = [f"{key}:{random.choice(values)}" for key, values in FIELD_VALUES.items() if random.random() < 0.9]
+    if random.random() < 0.9:
+        fields.append(f"pid:{random.randrange(10 ** random.randint(8, 10)):09d}")
+    random.shuffle(fields)
+    split = random.randint(0, len(fields))
+    return " ".join(fields[:split]) + "\n" + " ".join(fields[split:]) + "\n"
+
+
+def legacy_count() -> tuple:
+    valid_passports = 0
+    valid_passports_part_2 = 0
+    for passport in day4.read_passports():
+        if day4.is_valid(passport):
+            valid_passports += 1
+            if day4.is_valid_part_2(passport):
+                valid_passports_part_2 += 1
+    return valid_passports, valid_passports_part_2
+
+
+def main() -> None:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        day4.INPUT = os.path.join(tmp, "input")
+        with open(day4.INPUT, "w") as fout:
+            fout.write("\n".join(synthetic_passport() for _ in range(PASSPORTS)))
+
+        expected = None
+        for name, func in (
+            ("dict-based", legacy_count),
+            ("compiled", lambda: day4.count_valid_passports(day4.INPUT)),
+            ("parallel", lambda: day4.parallel_count_valid_passports(day4.INPUT)),
+        ):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = result
+            assert result == expected, f"{name} counted {result}, dict-based counted {expected}"
+            print(f"{name}: {result}  {elapsed:.3f}s  {PASSPORTS / elapsed:.0f} passports/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
+import mmap
+import os
 import re
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, Pattern, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
 
 @dataclass
@@ -37,8 +40,14 @@ class RegexValidator:
         return self.regex.match(contents) is not None
 
 
+Validator = Union[RangeValidator, HeightValidator, RegexValidator]
+FieldCheck = Callable[[bytes], bool]
+
 INPUT = "input"
-REQUIRED_FIELDS: Dict[str, Union[RangeValidator, HeightValidator, RegexValidator]] = {
+CHUNK_SIZE = 16 * 1024 * 1024
+FIELD_CACHE_SIZE = 1 << 16
+RECORD_SEPARATOR = re.compile(rb"\n\s*\n")
+REQUIRED_FIELDS: Dict[str, Validator] = {
     "byr": RangeValidator(1920, 2002),
     "iyr": RangeValidator(2010, 2020),
     "eyr": RangeValidator(2020, 2030),
@@ -74,6 +83,127 @@ def read_passports() -> Iterable[Dict[str, str]]:
         yield passport
 
 
+def compile_validator(validator: Validator) -> FieldCheck:
+    if isinstance(validator, RangeValidator):
+        low, high = validator.min, validator.max
+
+        def check_range(contents: bytes) -> bool:
+            try:
+                return low <= int(contents) <= high
+            except ValueError:
+                return False
+        return check_range
+
+    if isinstance(validator, HeightValidator):
+        subchecks = [(ending.encode(), compile_validator(sub)) for ending, sub in validator.subvalidators]
+
+        def check_height(contents: bytes) -> bool:
+            for ending, subcheck in subchecks:
+                if contents.endswith(ending):
+                    return subcheck(contents[:-len(ending)])
+            return False
+        return check_height
+
+    if isinstance(validator, RegexValidator):
+        match = re.compile(validator.regex.pattern.encode(), validator.regex.flags & ~re.UNICODE).match
+        return lambda contents: match(contents) is not None
+
+    raise TypeError(f"Unsupported validator {validator!r}")
+
+
+class CompiledRules:
+    def __init__(self, rules: Dict[str, Validator]) -> None:
+        self.checks: Dict[bytes, Tuple[int, FieldCheck]] = {
+            key.encode(): (1 << i, compile_validator(validator)) for i, (key, validator) in enumerate(rules.items())
+        }
+        self.all_fields = (1 << len(rules)) - 1
+        self.field_cache: Dict[bytes, Tuple[int, int]] = {}
+
+    def classify_field(self, field: bytes) -> Tuple[int, int]:
+        key, _, value = field.partition(b":")
+        entry = self.checks.get(key)
+        if entry is None:
+            return 0, 0
+        bit, check = entry
+        return bit, bit if check(value) else 0
+
+    def count_valid(self, records: Iterable[bytes]) -> Tuple[int, int]:
+        field_cache = self.field_cache
+        all_fields = self.all_fields
+        valid_passports = 0
+        valid_passports_part_2 = 0
+
+        for record in records:
+            present = 0
+            valid = 0
+            for field in record.split():
+                entry = field_cache.get(field)
+                if entry is None:
+                    entry = self.classify_field(field)
+                    if len(field_cache) < FIELD_CACHE_SIZE:
+                        field_cache[field] = entry
+                bit, valid_bit = entry
+                present |= bit
+                valid = (valid & ~bit) | valid_bit
+            if present == all_fields:
+                valid_passports += 1
+                if valid == all_fields:
+                    valid_passports_part_2 += 1
+
+        return valid_passports, valid_passports_part_2
+
+
+def read_records(path: str = INPUT, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    remainder = b""
+    with open(path, "rb") as fin:
+        for chunk in iter(lambda: fin.read(chunk_size), b""):
+            records = RECORD_SEPARATOR.split(remainder + chunk)
+            remainder = records.pop()
+            yield from records
+    if remainder:
+        yield remainder
+
+
+def count_valid_passports(path: str = INPUT, rules: Dict[str, Validator] = REQUIRED_FIELDS) -> Tuple[int, int]:
+    return CompiledRules(rules).count_valid(read_records(path))
+
+
+def record_aligned_ranges(path: str, chunk_size: int = CHUNK_SIZE) -> List[Tuple[int, int]]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    ranges = []
+    with open(path, "rb") as fin, mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        start = 0
+        while start < size:
+            match = RECORD_SEPARATOR.search(buf, min(start + chunk_size, size))
+            end = size if match is None else match.end()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def count_valid_in_range(path: str, start: int, end: int, rules: Dict[str, Validator]) -> Tuple[int, int]:
+    with open(path, "rb") as fin, mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        records = RECORD_SEPARATOR.split(buf[start:end])
+    return CompiledRules(rules).count_valid(records)
+
+
+def parallel_count_valid_passports(
+    path: str = INPUT,
+    rules: Dict[str, Validator] = REQUIRED_FIELDS,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[int, int]:
+    ranges = record_aligned_ranges(path, chunk_size)
+    if not ranges:
+        return 0, 0
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(count_valid_in_range, [path] * len(ranges), starts, ends, [rules] * len(ranges)))
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
 def main() -> None:
     valid_passports = 0
     valid_passports_part_2 = 0
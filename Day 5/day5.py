@@ -1,20 +1,58 @@
-from typing import Optional
+import re
+
+from typing import Iterable, List, Tuple
 
 INPUT = "input"
 ROW_SPECIFIERS = 7
+COLUMN_SPECIFIERS = 3
 POSITIVE_INDICATORS = {"B", "R"}
+NEGATIVE_INDICATORS = {"F", "L"}
+SEAT_TABLE = str.maketrans({**{v: "1" for v in POSITIVE_INDICATORS}, **{v: "0" for v in NEGATIVE_INDICATORS}})
+FREE_SEAT_REGEX = re.compile("1")
+FREE_BLOCK_REGEX = re.compile("1+")
 
 
 def parse_seat_part(seat_part: str) -> int:
-    result = 0
-    for i, v in enumerate(reversed(seat_part)):
-        if v in POSITIVE_INDICATORS:
-            result |= 1 << i
-    return result
+    return int(seat_part.translate(SEAT_TABLE), 2)
 
 
 def parse_seat(seat: str) -> int:
-    return parse_seat_part(seat[:ROW_SPECIFIERS]) * 8 + parse_seat_part(seat[ROW_SPECIFIERS:])
+    return parse_seat_part(seat[:ROW_SPECIFIERS]) << COLUMN_SPECIFIERS | parse_seat_part(seat[ROW_SPECIFIERS:])
+
+
+def decode_seats(buffer: str) -> List[int]:
+    return [int(seat, 2) for seat in buffer.translate(SEAT_TABLE).split()]
+
+
+class SeatMap:
+    def __init__(self, row_specifiers: int = ROW_SPECIFIERS, column_specifiers: int = COLUMN_SPECIFIERS) -> None:
+        self.columns = 1 << column_specifiers
+        self.size = 1 << (row_specifiers + column_specifiers)
+        self.occupied = bytearray((self.size + 7) // 8)
+
+    def occupy(self, seat_ids: Iterable[int]) -> None:
+        occupied = self.occupied
+        for seat_id in seat_ids:
+            occupied[seat_id >> 3] |= 1 << (seat_id & 7)
+
+    def is_occupied(self, seat_id: int) -> bool:
+        return (self.occupied[seat_id >> 3] >> (seat_id & 7)) & 1 == 1
+
+    def free_bits(self) -> str:
+        free = ~int.from_bytes(self.occupied, "little") & ((1 << self.size) - 1)
+        return format(free, f"0{self.size}b")[::-1]
+
+    def free_seats(self) -> List[int]:
+        return [match.start() for match in FREE_SEAT_REGEX.finditer(self.free_bits())]
+
+    def free_blocks(self, min_length: int = 1) -> List[Tuple[int, int]]:
+        free_bits = self.free_bits()
+        blocks = []
+        for row_start in range(0, self.size, self.columns):
+            for match in FREE_BLOCK_REGEX.finditer(free_bits, row_start, row_start + self.columns):
+                if match.end() - match.start() >= min_length:
+                    blocks.append((match.start(), match.end() - match.start()))
+        return blocks
 
 
 def sum_a_to_b_inclusive(a: int, b: int) -> int:
@@ -23,19 +61,14 @@ def sum_a_to_b_inclusive(a: int, b: int) -> int:
 
 
 def main() -> None:
-    total = 0
-    min_id: Optional[int] = None
-    max_id: Optional[int] = None
-
     with open(INPUT, "r") as fin:
-        for line in fin:
-            seat_id = parse_seat(line.strip())
-            total += seat_id
-            min_id = seat_id if min_id is None else min(min_id, seat_id)
-            max_id = seat_id if max_id is None else max(max_id, seat_id)
+        seat_ids = decode_seats(fin.read())
+
+    min_id = min(seat_ids)
+    max_id = max(seat_ids)
 
     print(max_id)
-    print(sum_a_to_b_inclusive(min_id, max_id) - total)
+    print(sum_a_to_b_inclusive(min_id, max_id) - sum(seat_ids))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+import os
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+from functools import reduce
+from operator import and_, or_
+from typing import Tuple
+
+import day6
+
+GROUPS = 2 * 10 ** 5
+
+
+def synthetic_group() -> str:
+    people = random.randint(1, 5)
+    return "".join(
+        "".join(random.sample(string.ascii_lowercase, random.randint(1, 26))) + "\n" for _ in range(people)
+    )
+
+
+def set_counts() -> Tuple[int, int]:
+    count = 0
+    intersection_count = 0
+    groups = list(day6.read_groups_from_file())
+    for group in groups:
+        count += len(set().union(*group))
+        intersection_count += len(set.intersection(*group))
+    return count, intersection_count
+
+
+def mask_counts() -> Tuple[int, int]:
+    count = 0
+    intersection_count = 0
+    groups = list(day6.read_group_masks())
+    for group in groups:
+        count += day6.popcount(reduce(or_, group))
+        intersection_count += day6.popcount(reduce(and_, group))
+    return count, intersection_count
+
+
+def main() -> None:
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        day6.INPUT = os.path.join(tmp, "input")
+        with open(day6.INPUT, "w") as fout:
+            fout.write("\n".join(synthetic_group() for _ in range(GROUPS)))
+
+        for name, func in (("sets", set_counts), ("bitmasks", mask_counts)):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name}: {result}  {elapsed:.3f}s  peak {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
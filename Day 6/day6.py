@@ -1,6 +1,13 @@
-from typing import Iterable, List, Set
+import re
+
+from functools import reduce
+from operator import and_, or_
+from typing import Iterable, Iterator, List, Set
 
 INPUT = "input"
+CHUNK_SIZE = 16 * 1024 * 1024
+GROUP_SEPARATOR = re.compile(r"\n\s*\n")
+ANSWER_BITS = {chr(ord("a") + i): 1 << i for i in range(26)}
 
 
 def read_groups_from_file() -> Iterable[List[Set[str]]]:
@@ -17,20 +24,37 @@ def read_groups_from_file() -> Iterable[List[Set[str]]]:
         yield group
 
 
+def person_mask(answers: str) -> int:
+    mask = 0
+    for answer in answers:
+        mask |= ANSWER_BITS[answer]
+    return mask
+
+
+def popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def read_group_masks(chunk_size: int = CHUNK_SIZE) -> Iterator[List[int]]:
+    remainder = ""
+    with open(INPUT, "r") as fin:
+        for chunk in iter(lambda: fin.read(chunk_size), ""):
+            groups = GROUP_SEPARATOR.split(remainder + chunk)
+            remainder = groups.pop()
+            for group in groups:
+                yield [person_mask(person) for person in group.split()]
+    if remainder.strip():
+        yield [person_mask(person) for person in remainder.split()]
+
+
 def main() -> None:
     count = 0
     intersection_count = 0
 
-    for group in read_groups_from_file():
-        union = set()
-        intersection = None
-
-        for person in group:
-            union.update(person)
-            intersection = person if intersection is None else intersection & person
-
-        count += len(union)
-        intersection_count += len(intersection)
+    for group in read_group_masks():
+        if group:
+            count += popcount(reduce(or_, group))
+            intersection_count += popcount(reduce(and_, group))
 
     print(count)
     print(intersection_count)
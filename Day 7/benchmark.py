@@ -0,0 +1,46 @@
+import random
+import time
+
+import day7
+
+COLORS = 10 ** 5
+MAX_CONTENTS = 4
+ADJECTIVES = ["light", "dark", "bright", "muted", "shiny", "faded", "dotted", "vibrant", "pale", "wavy"]
+
+
+def synthetic_rules() -> str:
+    colors = [f"{random.choice(ADJECTIVES)} c{i}" for i in range(COLORS)]
+    lines = []
+    for i, color in enumerate(colors):
+        later = colors[i + 1:i + 1 + 10 * MAX_CONTENTS]
+        contents = random.sample(later, min(len(later), random.randint(0, MAX_CONTENTS)))
+        if contents:
+            clauses = ", ".join(
+                f"{n} {child} {'bag' if n == 1 else 'bags'}" for n, child in ((random.randint(1, 5), c) for c in contents)
+            )
+        else:
+            clauses = "no other bags"
+        lines.append(f"{color} bags contain {clauses}.\n")
+    return "".join(lines)
+
+
+def main() -> None:
+    random.seed(0)
+    text = synthetic_rules()
+    megabytes = len(text) / 2 ** 20
+
+    for name, parse in (
+        ("regex Bag", lambda: [(bag.color, bag.contents.items()) for bag in map(day7.Bag, text.splitlines())]),
+        ("bulk parser", lambda: list(day7.parse_rules(text))),
+    ):
+        start = time.perf_counter()
+        rules = parse()
+        parsed = time.perf_counter() - start
+        graph = day7.BagGraph(rules)
+        total = time.perf_counter() - start
+        print(f"{name}: {len(graph.colors)} colors  parse {parsed:.3f}s ({megabytes / parsed:.1f} MB/s, "
+              f"{COLORS / parsed:.0f} rules/s)  parse+graph {total:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
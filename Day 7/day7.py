@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import re
 
-from typing import Dict, Iterable
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 INPUT = "input"
 MY_BAG = "shiny gold"
 BAG_REGEX = re.compile(r"^(?P<color>.*) bags contain (?P<contents>.*)\.$")
 CONTENTS_REGEX = re.compile(r"^(?P<number>\d*) (?P<color>.*) bags?$")
+RULE_SEPARATOR = " bags contain "
+NO_CONTENTS = "no other bags"
+SET_BIT_REGEX = re.compile("1")
+
+Rule = Tuple[str, Iterable[Tuple[str, int]]]
 
 
 class Bag:
@@ -22,23 +28,162 @@ class Bag:
                 assert contents_match is not None
                 self.contents[contents_match.group("color")] = int(contents_match.group("number"))
 
-        self._contains_my_bag = None
-        self._total_bags = None
+        self._contains_my_bag: Optional[bool] = None
+        self._total_bags: Optional[int] = None
 
     def contains_my_bag(self, bag_lookup: Dict[str, Bag]) -> bool:
         if self._contains_my_bag is not None:
             return self._contains_my_bag
 
-        if MY_BAG in self.contents:
-            return True
-
-        return any(bag_lookup[content].contains_my_bag(bag_lookup) for content in self.contents)
+        self._contains_my_bag = MY_BAG in self.contents or any(
+            bag_lookup[content].contains_my_bag(bag_lookup) for content in self.contents
+        )
+        return self._contains_my_bag
 
     def total_bags(self, bag_lookup: Dict[str, Bag]) -> int:
         if self._total_bags is not None:
             return self._total_bags
 
-        return sum(num * (1 + bag_lookup[content].total_bags(bag_lookup)) for content, num in self.contents.items())
+        self._total_bags = sum(
+            num * (1 + bag_lookup[content].total_bags(bag_lookup)) for content, num in self.contents.items()
+        )
+        return self._total_bags
+
+
+def parse_rules(text: str) -> Iterator[Rule]:
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        color, separator, contents = line.partition(RULE_SEPARATOR)
+        if not separator:
+            raise ValueError(f"Malformed bag rule: {line!r}")
+        contents = contents.rstrip(".")
+        if contents == NO_CONTENTS:
+            yield color, ()
+            continue
+        rule_contents = []
+        for clause in contents.split(", "):
+            number, _, described = clause.partition(" ")
+            rule_contents.append((described.rpartition(" ")[0], int(number)))
+        yield color, rule_contents
+
+
+class BagGraph:
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.index: Dict[str, int] = {}
+        self.colors: List[str] = []
+        self.children: List[List[Tuple[int, int]]] = []
+        for color, contents in rules:
+            node = self.node(color)
+            self.children[node] = [(self.node(child), num) for child, num in contents]
+
+        self.parents: List[List[int]] = [[] for _ in self.colors]
+        for node, children in enumerate(self.children):
+            for child, _ in children:
+                self.parents[child].append(node)
+
+        self.order = self._topological_order()
+        self._total_bags: Optional[List[int]] = None
+        self._containers: Dict[int, int] = {}
+
+    @classmethod
+    def from_bags(cls, bags: Iterable[Bag]) -> BagGraph:
+        return cls((bag.color, bag.contents.items()) for bag in bags)
+
+    @classmethod
+    def from_text(cls, text: str) -> BagGraph:
+        return cls(parse_rules(text))
+
+    def node(self, color: str) -> int:
+        node = self.index.get(color)
+        if node is None:
+            node = self.index[color] = len(self.colors)
+            self.colors.append(color)
+            self.children.append([])
+        return node
+
+    def _topological_order(self) -> List[int]:
+        remaining_children = [len(children) for children in self.children]
+        ready = deque(node for node, count in enumerate(remaining_children) if count == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for parent in self.parents[node]:
+                remaining_children[parent] -= 1
+                if remaining_children[parent] == 0:
+                    ready.append(parent)
+
+        if len(order) != len(self.colors):
+            cycle = self._find_cycle(remaining_children)
+            raise ValueError(f"Bag rules contain a cycle: {' -> '.join(self.colors[node] for node in cycle)}")
+        return order
+
+    def _find_cycle(self, remaining_children: List[int]) -> List[int]:
+        # Every node left over by Kahn's algorithm still has a left-over child, so following left-over children
+        # from any of them must revisit a node, and the path from that node back to itself is a cycle.
+        node = next(node for node, count in enumerate(remaining_children) if count > 0)
+        path: List[int] = []
+        position: Dict[int, int] = {}
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(child for child, _ in self.children[node] if remaining_children[child] > 0)
+        return path[position[node]:] + [node]
+
+    def contains_bag(self, color: str) -> List[bool]:
+        target = self.index[color]
+        contains = [False] * len(self.colors)
+        for node in self.order:
+            contains[node] = any(child == target or contains[child] for child, _ in self.children[node])
+        return contains
+
+    def total_bags(self) -> List[int]:
+        if self._total_bags is None:
+            totals = [0] * len(self.colors)
+            for node in self.order:
+                totals[node] = sum(num * (1 + totals[child]) for child, num in self.children[node])
+            self._total_bags = totals
+        return self._total_bags
+
+    def _container_bits(self, target: int) -> int:
+        # Closures are cached as int bitsets over node ids, one bit per color, so a cached query costs n / 8 bytes
+        # however many containers it has.
+        cached = self._containers.get(target)
+        if cached is not None:
+            return cached
+
+        bits = 0
+        seen = set()
+        pending = list(self.parents[target])
+        while pending:
+            node = pending.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            cached_parent = self._containers.get(node)
+            if cached_parent is not None:
+                bits |= cached_parent
+                continue
+            pending.extend(self.parents[node])
+
+        flags = bytearray((len(self.colors) + 7) // 8)
+        for node in seen:
+            flags[node >> 3] |= 1 << (node & 7)
+        bits |= int.from_bytes(flags, "little")
+        self._containers[target] = bits
+        return bits
+
+    def containers(self, color: str) -> List[str]:
+        bits = format(self._container_bits(self.index[color]), "b")[::-1]
+        return [self.colors[match.start()] for match in SET_BIT_REGEX.finditer(bits)]
+
+    def count_containers(self, color: str) -> int:
+        return bin(self._container_bits(self.index[color])).count("1")
+
+    def bags_inside(self, color: str) -> int:
+        return self.total_bags()[self.index[color]]
 
 
 def read_bags() -> Iterable[Bag]:
@@ -48,10 +193,11 @@ def read_bags() -> Iterable[Bag]:
 
 
 def main() -> None:
-    bag_lookup = {bag.color: bag for bag in read_bags()}
+    with open(INPUT, "r") as fin:
+        graph = BagGraph.from_text(fin.read())
 
-    print(sum(bag.contains_my_bag(bag_lookup) for bag in bag_lookup.values()))
-    print(bag_lookup[MY_BAG].total_bags(bag_lookup))
+    print(graph.count_containers(MY_BAG))
+    print(graph.bags_inside(MY_BAG))
 
 
 if __name__ == "__main__":
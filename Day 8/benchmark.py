@@ -0,0 +1,41 @@
+import random
+import time
+
+import day8
+
+PROGRAM_LENGTH = 10 ** 6
+ACC_RUN_LENGTHS = [1, 4, 16]
+
+
+def synthetic_program(run_length: int) -> day8.ProgramLines:
+    lines: day8.ProgramLines = []
+    while len(lines) < PROGRAM_LENGTH - 1:
+        lines.extend((day8.Operation.acc, random.randint(-50, 50)) for _ in range(run_length))
+        lines.append((random.choice([day8.Operation.nop, day8.Operation.jmp]), 1))
+    lines.append((day8.Operation.jmp, -len(lines)))
+    return lines
+
+
+def main() -> None:
+    random.seed(0)
+    for run_length in ACC_RUN_LENGTHS:
+        lines = synthetic_program(run_length)
+        program = day8.Program(list(lines))
+        start = time.perf_counter()
+        program.run_until_loop_or_end()
+        elapsed = time.perf_counter() - start
+        executed = len(program.visited_lines)
+        print(f"acc runs of {run_length:>2}  interpreter: {program.accumulator}  {executed / elapsed:,.0f} instr/s")
+
+        for fuse in (False, True):
+            compiled = day8.CompiledProgram(lines, fuse_acc_runs=fuse)
+            start = time.perf_counter()
+            compiled.run_until_loop_or_end()
+            elapsed = time.perf_counter() - start
+            executed = compiled.visited.count(1)
+            print(f"acc runs of {run_length:>2}  compiled (fused={fuse}): {compiled.accumulator}  "
+                  f"{executed / elapsed:,.0f} instr/s")
+
+
+if __name__ == "__main__":
+    main()
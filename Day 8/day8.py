@@ -1,7 +1,13 @@
+from array import array
+from bisect import bisect_right
+from collections import Counter
 from enum import Enum
-from typing import Dict, List, Set, Tuple
+from heapq import nlargest
+from operator import itemgetter
+from typing import List, Optional, Set, Tuple
 
 INPUT = "input"
+TRACE_CAPACITY = 1 << 16
 
 
 class Operation(Enum):
@@ -12,17 +18,86 @@ class Operation(Enum):
 
 ProgramLines = List[Tuple[Operation, int]]
 
+ACC = 0
+JMP = 1
+NOP = 2
+OPCODES = {Operation.acc: ACC, Operation.jmp: JMP, Operation.nop: NOP}
+
+
+class ExecutionTracer:
+    # Within a single run every line executes at most once, so counts and loop entries only become meaningful when
+    # they accumulate across runs (e.g. before and after fix_program). Each run is marked in run_starts so the
+    # timeline can be split back into runs.
+    def __init__(self, capacity: int = TRACE_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counts = array("q")
+        self.loop_entries: Counter[int] = Counter()
+        self.steps = 0
+        self.run_starts = array("q")
+        self.timeline_positions = array("q", bytes(8 * capacity))
+        self.timeline_accumulators = array("q", bytes(8 * capacity))
+
+    def attach(self, program_length: int) -> None:
+        if len(self.counts) < program_length:
+            self.counts.extend(bytes(8 * (program_length - len(self.counts))))
+
+    def start_run(self) -> None:
+        if self.run_starts and self.run_starts[-1] == self.steps:
+            return
+        self.run_starts.append(self.steps)
+
+    def record(self, position: int, accumulator: int) -> None:
+        self.counts[position] += 1
+        slot = self.steps % self.capacity
+        self.timeline_positions[slot] = position
+        self.timeline_accumulators[slot] = accumulator
+        self.steps += 1
+
+    def record_loop_entry(self, position: int) -> None:
+        self.loop_entries[position] += 1
+
+    def timeline(self) -> List[Tuple[int, int, int, int]]:
+        first = max(0, self.steps - self.capacity)
+        return [
+            (
+                bisect_right(self.run_starts, step) - 1,
+                step,
+                self.timeline_positions[step % self.capacity],
+                self.timeline_accumulators[step % self.capacity],
+            )
+            for step in range(first, self.steps)
+        ]
+
+    def hottest(self, n: int) -> List[Tuple[int, int]]:
+        return nlargest(n, ((line, count) for line, count in enumerate(self.counts) if count), key=itemgetter(1))
+
+    def export(self, path: str) -> None:
+        with open(path, "w") as fout:
+            for line, count in enumerate(self.counts):
+                if count:
+                    fout.write(f"count\t{line}\t{count}\n")
+            for line, count in sorted(self.loop_entries.items()):
+                fout.write(f"loop\t{line}\t{count}\n")
+            for run, start in enumerate(self.run_starts):
+                fout.write(f"run\t{run}\t{start}\n")
+            for run, step, position, accumulator in self.timeline():
+                fout.write(f"acc\t{run}\t{step}\t{position}\t{accumulator}\n")
+
 
 class Program:
-    def __init__(self, lines: ProgramLines):
+    def __init__(self, lines: ProgramLines, tracer: Optional[ExecutionTracer] = None):
         self.lines = lines
+        self.tracer = tracer
+        if tracer is not None:
+            tracer.attach(len(lines))
         self.reset()
-        self.winning_lines: Dict[int, bool] = {}
 
     def reset(self) -> None:
         self.position = 0
         self.accumulator = 0
         self.visited_lines: Set[int] = set()
+        if self.tracer is not None:
+            self.tracer.start_run()
 
     def get_next_line_offset(self, op: Operation, arg: int) -> int:
         if op == Operation.jmp:
@@ -30,6 +105,10 @@ class Program:
         return 1
 
     def run_until_loop_or_end(self) -> None:
+        if self.tracer is not None:
+            self.run_traced(self.tracer)
+            return
+
         while self.position not in self.visited_lines and self.position < len(self.lines):
             self.visited_lines.add(self.position)
             op, arg = self.lines[self.position]
@@ -37,29 +116,60 @@ class Program:
                 self.accumulator += arg
             self.position += self.get_next_line_offset(op, arg)
 
-    def is_winning_line(self, line_num: int) -> bool:
-        if line_num >= len(self.lines):
-            return True
-        if line_num in self.winning_lines:
-            return self.winning_lines[line_num]
-        if line_num in self.visited_lines:
-            self.winning_lines[line_num] = False
-            return False
+    def run_traced(self, tracer: ExecutionTracer) -> None:
+        while self.position not in self.visited_lines and self.position < len(self.lines):
+            self.visited_lines.add(self.position)
+            op, arg = self.lines[self.position]
+            if op == Operation.acc:
+                self.accumulator += arg
+            tracer.record(self.position, self.accumulator)
+            offset = self.get_next_line_offset(op, arg)
+            if offset <= 0:
+                tracer.record_loop_entry(self.position + offset)
+            self.position += offset
 
-        self.visited_lines.add(line_num)
+    def winning_lines(self) -> bytearray:
+        end = len(self.lines)
+        targets = [
+            min(line_num + self.get_next_line_offset(op, arg), end) for line_num, (op, arg) in enumerate(self.lines)
+        ]
 
-        result = self.is_winning_line(line_num + self.get_next_line_offset(*self.lines[line_num]))
-        self.winning_lines[line_num] = result
-        return result
+        predecessor_starts = array("q", bytes(8 * (end + 2)))
+        for target in targets:
+            if target >= 0:
+                predecessor_starts[target + 1] += 1
+        for i in range(1, end + 2):
+            predecessor_starts[i] += predecessor_starts[i - 1]
+        predecessors = array("q", bytes(8 * predecessor_starts[end + 1]))
+        next_slot = predecessor_starts[:end + 1]
+        for line_num, target in enumerate(targets):
+            if target >= 0:
+                predecessors[next_slot[target]] = line_num
+                next_slot[target] += 1
+
+        winning = bytearray(end + 1)
+        winning[end] = 1
+        pending = [end]
+        while pending:
+            target = pending.pop()
+            for line_num in predecessors[predecessor_starts[target]:predecessor_starts[target + 1]]:
+                if not winning[line_num]:
+                    winning[line_num] = 1
+                    pending.append(line_num)
+        return winning
 
     def fix_program(self) -> None:
+        winning = self.winning_lines()
+        end = len(self.lines)
+        visited = bytearray(end)
         position = 0
-        while True:
+        while 0 <= position < end and not visited[position]:
+            visited[position] = 1
             op, arg = self.lines[position]
-            if op == Operation.jmp and self.is_winning_line(position + 1):
+            if op == Operation.jmp and winning[position + 1]:
                 self.lines[position] = (Operation.nop, arg)
                 break
-            elif op == Operation.nop and self.is_winning_line(position + arg):
+            elif op == Operation.nop and position + arg >= 0 and winning[min(position + arg, end)]:
                 self.lines[position] = (Operation.jmp, arg)
                 break
             position += self.get_next_line_offset(op, arg)
@@ -68,6 +178,62 @@ class Program:
         self.reset()
 
 
+class CompiledProgram:
+    def __init__(self, lines: ProgramLines, fuse_acc_runs: bool = True) -> None:
+        self.ops = bytes(OPCODES[op] for op, _ in lines)
+        self.args = array("q", (arg for _, arg in lines))
+        self.fused_args = array("q", self.args)
+        self.fused_next = array("q", range(1, len(lines) + 1))
+        if fuse_acc_runs:
+            for i in range(len(lines) - 2, -1, -1):
+                if self.ops[i] == ACC and self.ops[i + 1] == ACC:
+                    self.fused_args[i] += self.fused_args[i + 1]
+                    self.fused_next[i] = self.fused_next[i + 1]
+        self.reset()
+
+    def reset(self) -> None:
+        self.position = 0
+        self.accumulator = 0
+        self.visited = bytearray(len(self.ops))
+
+    def run_until_loop_or_end(self) -> None:
+        ops = self.ops
+        args = self.args
+        fused_args = self.fused_args
+        fused_next = self.fused_next
+        visited = self.visited
+        end = len(ops)
+        position = self.position
+        accumulator = self.accumulator
+
+        while 0 <= position < end and not visited[position]:
+            op = ops[position]
+            if op != ACC:
+                visited[position] = 1
+                position += args[position] if op == JMP else 1
+                continue
+
+            run_end = fused_next[position]
+            if run_end == position + 1:
+                visited[position] = 1
+                accumulator += args[position]
+                position = run_end
+                continue
+
+            loop_at = visited.find(1, position, run_end)
+            if loop_at != -1:
+                visited[position:loop_at] = b"\x01" * (loop_at - position)
+                accumulator += fused_args[position] - fused_args[loop_at]
+                position = loop_at
+                break
+            visited[position:run_end] = b"\x01" * (run_end - position)
+            accumulator += fused_args[position]
+            position = run_end
+
+        self.position = position
+        self.accumulator = accumulator
+
+
 def read_program() -> ProgramLines:
     result = []
     with open(INPUT, "r") as fin:
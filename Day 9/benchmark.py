@@ -0,0 +1,34 @@
+import random
+import time
+from typing import List
+
+import day9
+
+WINDOW_SIZES = [25, 10 ** 3, 10 ** 4, 10 ** 5]
+STREAM_LENGTHS = [10 ** 3, 10 ** 4]
+
+
+def synthetic_stream(window_size: int, length: int) -> List[int]:
+    values = random.sample(range(1, 1 << 40), window_size)
+    while len(values) < window_size + length:
+        first, second = random.sample(range(len(values) - window_size, len(values)), 2)
+        if values[first] != values[second]:
+            values.append(values[first] + values[second])
+    values.append(1)
+    return values
+
+
+def main() -> None:
+    random.seed(0)
+    for window_size in WINDOW_SIZES:
+        for length in STREAM_LENGTHS:
+            values = synthetic_stream(window_size, length)
+            start = time.perf_counter()
+            invalid = day9.find_first_invalid(iter(values), window_size)
+            elapsed = time.perf_counter() - start
+            print(f"W={window_size:>6}  stream={length:>6}  first invalid={invalid}  {elapsed:.3f}s  "
+                  f"{length / elapsed:,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main()
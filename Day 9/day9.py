@@ -1,7 +1,8 @@
 import itertools
 
-from collections import deque
-from typing import Collection, Iterator, OrderedDict
+from array import array
+from collections import Counter, deque
+from typing import Collection, Deque, Dict, Iterator, Optional, Sequence, Tuple
 
 INPUT = "input"
 WINDOW_SIZE = 25
@@ -11,11 +12,20 @@ ELASTIC_SUM_MIN_SIZE = 2
 class SlidingWindowHashSet:
     def __init__(self, items: Iterator[int], window_size: int) -> None:
         self.items = items
-        self.window = OrderedDict[int, None]((v, None) for v in itertools.islice(items, window_size))
+        self.order: Deque[int] = deque(itertools.islice(items, window_size))
+        self.window = Counter(self.order)
 
     def slide(self) -> None:
-        self.window.popitem(last=False)
-        self.window[next(self.items)] = None
+        self.push(next(self.items))
+
+    def push(self, item: int) -> None:
+        oldest = self.order.popleft()
+        if self.window[oldest] == 1:
+            del self.window[oldest]
+        else:
+            self.window[oldest] -= 1
+        self.order.append(item)
+        self.window[item] += 1
 
 
 def two_sum(container: Collection[int], target: int) -> bool:
@@ -25,6 +35,15 @@ def two_sum(container: Collection[int], target: int) -> bool:
     return False
 
 
+def find_first_invalid(items: Iterator[int], window_size: int = WINDOW_SIZE) -> Optional[int]:
+    sliding_window = SlidingWindowHashSet(items, window_size)
+    for item in items:
+        if not two_sum(sliding_window.window, item):
+            return item
+        sliding_window.push(item)
+    return None
+
+
 def find_elastic_sum(items: Iterator[int], target: int) -> Collection[int]:
     current_items = deque(itertools.islice(items, ELASTIC_SUM_MIN_SIZE))
     current_sum = sum(current_items)
@@ -40,6 +59,28 @@ def find_elastic_sum(items: Iterator[int], target: int) -> Collection[int]:
     return current_items
 
 
+def prefix_sums(values: Sequence[int]) -> array:
+    return array("q", itertools.accumulate(values, initial=0))
+
+
+def find_contiguous_range(
+    values: Sequence[int], target: int, min_size: int = ELASTIC_SUM_MIN_SIZE
+) -> Optional[Tuple[int, int]]:
+    prefix = prefix_sums(values)
+    first_seen: Dict[int, int] = {}
+    for end in range(min_size, len(prefix)):
+        first_seen.setdefault(prefix[end - min_size], end - min_size)
+        start = first_seen.get(prefix[end] - target)
+        if start is not None:
+            return start, end
+    return None
+
+
+def read_numbers() -> array:
+    with open(INPUT, "r") as fin:
+        return array("q", (int(line) for line in fin))
+
+
 def input_generator() -> Iterator[int]:
     with open(INPUT, "r") as fin:
         for line in fin:
@@ -47,17 +88,14 @@ def input_generator() -> Iterator[int]:
 
 
 def main() -> None:
-    sliding_window_generator, iterable = itertools.tee(input_generator())
-    sliding_window = SlidingWindowHashSet(sliding_window_generator, WINDOW_SIZE)
-
-    for item in itertools.islice(iterable, WINDOW_SIZE, None):
-        if not two_sum(sliding_window.window, item):
-            part1 = item
-            break
-        sliding_window.slide()
-
+    numbers = read_numbers()
+    part1 = find_first_invalid(iter(numbers))
+    assert part1 is not None
     print(part1)
-    elastic_sum = find_elastic_sum(input_generator(), part1)
+
+    elastic_range = find_contiguous_range(numbers, part1)
+    assert elastic_range is not None
+    elastic_sum = numbers[elastic_range[0]:elastic_range[1]]
     print(min(elastic_sum) + max(elastic_sum))
 
 